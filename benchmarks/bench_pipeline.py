@@ -0,0 +1,109 @@
+"""Time the full-time pipeline, stage by stage, on synthetic exports.
+
+    python benchmarks/bench_pipeline.py                       # 10k .. 10M rows
+    python benchmarks/bench_pipeline.py --sizes 10000 100000 --json bench.json
+    python benchmarks/bench_pipeline.py --engine duckdb       # pipeline row via DuckDB
+
+Generated files are kept in --data-dir and reused across runs. Sizes above
+--stage-limit only run the end-to-end pipeline (which streams large CSVs),
+since the per-stage path holds the whole frame in memory.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fulltime_core import (  # noqa: E402
+    ENGINES,
+    MONTHS_REQUIRED,
+    aggregate_monthly,
+    build_hours_matrix,
+    compact,
+    create_excel,
+    evaluate_months,
+    filter_rows,
+    load,
+    normalize,
+    resolve_engine,
+    run_pipeline,
+)
+from generate_export import XLSX_MAX_ROWS, write_export  # noqa: E402
+from instrumentation import StageLog  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+ROWS_PER_STAFF = 500
+
+
+def export_path(data_dir, rows, fmt):
+    path = data_dir / f"aloha_{rows}.{fmt}"
+    if not path.exists():
+        print(f"Generating {path} ...", flush=True)
+        write_export(path, rows, staff=max(rows // ROWS_PER_STAFF, 1))
+    return path
+
+
+def bench_stages(path, log):
+    with log.stage("load") as s:
+        raw = s.output(load(path.name, path))
+    with log.stage("filter", raw) as s:
+        filtered = s.output(filter_rows(raw))
+    with log.stage("normalize", filtered) as s:
+        normalized = s.output(normalize(filtered))
+    with log.stage("compact", normalized) as s:
+        df = s.output(compact(normalized))
+    with log.stage("aggregate_monthly", df) as s:
+        monthly = s.output(aggregate_monthly(df))
+    with log.stage("hours_matrix", monthly) as s:
+        staff, months, hours = s.output(build_hours_matrix(monthly))
+    with log.stage("evaluate", hours) as s:
+        pass_df, no_pass_df = s.output(
+            evaluate_months(staff, months, hours, months[-MONTHS_REQUIRED:])
+        )
+    with log.stage("create_excel", (pass_df, no_pass_df)) as s:
+        create_excel(pass_df, no_pass_df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--data-dir", type=Path, default=Path("bench_data"))
+    parser.add_argument("--stage-limit", type=int, default=1_000_000)
+    parser.add_argument(
+        "--engine", choices=ENGINES, default="pandas",
+        help="engine of the end-to-end pipeline row; pinned so sizes above "
+        "DUCKDB_AUTO_BYTES don't silently switch engines (default: pandas)",
+    )
+    parser.add_argument("--json", type=Path, help="write all stage records here")
+    args = parser.parse_args()
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    records = []
+    for rows in args.sizes:
+        if args.format == "xlsx" and rows > XLSX_MAX_ROWS:
+            print(f"Skipping {rows:,} rows: over the xlsx row limit")
+            continue
+
+        path = export_path(args.data_dir, rows, args.format)
+        # Recorded as resolved, so an "auto" run still says what it measured
+        engine = resolve_engine(path.name, path.stat().st_size, args.engine)
+        context = {"rows": rows, "format": args.format, "engine": engine}
+        log = StageLog(context=context)
+        if rows <= args.stage_limit:
+            bench_stages(path, log)
+        with log.stage("pipeline") as s:
+            s.output(run_pipeline(path.name, path, engine=engine)[1:])
+
+        print(f"\n{rows:,} rows ({path.stat().st_size / 1e6:.1f} MB), {engine} pipeline")
+        print(log.to_frame().to_string(index=False))
+        records += [{**context, **r} for r in log.records]
+
+    if args.json:
+        args.json.write_text(json.dumps(records, indent=2))
+
+
+if __name__ == "__main__":
+    main()
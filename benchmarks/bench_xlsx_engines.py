@@ -0,0 +1,53 @@
+"""Compare xlsx ingestion engines on a synthetic Aloha billing workbook.
+
+    python benchmarks/bench_xlsx_engines.py --rows 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import xlsx_io  # noqa: E402
+from fulltime_core import required_cols  # noqa: E402
+from generate_export import write_export  # noqa: E402
+
+
+def build_workbook(rows, seed=0):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "export.xlsx"
+        write_export(path, rows, seed=seed, staff=max(rows // 500, 1))
+        return path.read_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Building {args.rows:,}-row workbook...")
+    data = build_workbook(args.rows)
+    print(f"Workbook size: {len(data) / 1e6:.1f} MB")
+
+    engines = ["pandas", "openpyxl"]
+    if xlsx_io.XLSX_ENGINE == "calamine":
+        engines.append("calamine")
+    else:
+        print("python-calamine not installed; skipping calamine")
+
+    print(f"{'engine':<10} {'best s':>8} {'rows':>10}")
+    for engine in engines:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            df = xlsx_io.read_xlsx(data, required_cols, engine=engine)
+            best = min(best, time.perf_counter() - start)
+        print(f"{engine:<10} {best:>8.2f} {len(df):>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Check the DuckDB and Polars engines against the pandas monthly totals.
+
+Each engine reads the same synthetic export as CSV and as Parquet with a
+typed (datetime) Appt. Date column.
+
+    python benchmarks/check_engines.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+from importlib.util import find_spec
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fulltime_core import (  # noqa: E402
+    COL_DATE, COL_STAFF, EXTERNAL_ENGINES, external_monthly_totals, monthly_totals, prepare,
+)
+from generate_export import generate_frame  # noqa: E402
+
+
+def by_staff_month(totals):
+    totals = totals.astype({COL_STAFF: str})
+    return totals.set_index([COL_STAFF, "YearMonth"])["Hours"].sort_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    frame = generate_frame(args.rows, staff=max(args.rows // 500, 1), seed=args.seed)
+    expected = by_staff_month(monthly_totals(prepare(frame.copy())))
+    print(f"pandas: {expected.sum():,.2f} hours")
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "export.csv"
+        parquet_path = Path(tmp) / "export.parquet"
+        frame.to_csv(csv_path, index=False)
+        frame.assign(**{COL_DATE: pd.to_datetime(frame[COL_DATE], format="%m/%d/%Y")}).to_parquet(
+            parquet_path, index=False
+        )
+
+        for engine in EXTERNAL_ENGINES:
+            if find_spec(engine) is None:
+                print(f"{engine} not installed; skipping")
+                continue
+            for path in (csv_path, parquet_path):
+                got = by_staff_month(external_monthly_totals(engine, path.name, path))
+                ok = got.index.equals(expected.index) and (got - expected).abs().max() < 1e-9
+                failed |= not ok
+                print(f"{engine} {path.suffix}: {got.sum():,.2f} hours {'ok' if ok else 'MISMATCH'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Write synthetic Aloha Appointment Billing exports (CSV or xlsx).
+
+    python benchmarks/generate_export.py out.csv --rows 1000000 --staff 400 --months 12
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fulltime_core import SERVICE_VALUE  # noqa: E402
+
+XLSX_MAX_ROWS = 1_048_575
+CHUNK_ROWS = 500_000
+
+OTHER_SERVICES = ["Supervision", "Parent Training", "Assessment", "Direct Service BCBA"]
+# Aloha is not consistent about case/whitespace in these columns
+COMPLETED_YES = ["Yes", "Yes", "Yes", "yes", " Yes", "YES"]
+COMPLETED_NO = ["No", "no", "Cancelled"]
+SERVICE_VARIANTS = [SERVICE_VALUE, SERVICE_VALUE, SERVICE_VALUE, f"{SERVICE_VALUE} ", f" {SERVICE_VALUE}"]
+CLOCK = np.array([f"{h % 12 or 12}:00 {'AM' if h < 12 else 'PM'}" for h in range(24)], dtype=object)
+
+
+def generate_frame(
+    rows, staff=200, months=12, start="2024-01",
+    non_bt_share=0.15, not_completed_share=0.1, seed=0,
+):
+    rng = np.random.default_rng(seed)
+    staff_names = np.array([f"Staff {i:05d}" for i in range(staff)], dtype=object)
+    days = pd.date_range(pd.Period(start, freq="M").start_time, periods=months, freq="MS")
+    days = pd.date_range(days[0], days[-1] + pd.offsets.MonthEnd(0), freq="D")
+    day_labels = np.asarray(days.strftime("%m/%d/%Y"), dtype=object)
+
+    not_done = rng.random(rows) < not_completed_share
+    non_bt = rng.random(rows) < non_bt_share
+    completed = np.where(
+        not_done,
+        rng.choice(COMPLETED_NO, rows),
+        rng.choice(COMPLETED_YES, rows),
+    )
+    service = np.where(
+        non_bt,
+        rng.choice(OTHER_SERVICES, rows),
+        rng.choice(SERVICE_VARIANTS, rows),
+    )
+    start_hour = rng.integers(8, 18, rows)
+    units = rng.integers(2, 25, rows)
+
+    frame = pd.DataFrame({
+        "Client Name": rng.choice([f"Client {i}" for i in range(staff * 3)], rows),
+        "Client ID": rng.integers(100000, 999999, rows),
+        "Staff Name": staff_names[rng.integers(0, staff, rows)],
+        "Staff ID": rng.integers(1000, 9999, rows),
+        "Appt. Date": day_labels[rng.integers(0, len(day_labels), rows)],
+        "Start Time": CLOCK[start_hour],
+        "End Time": CLOCK[start_hour + 2],
+        "Units": units,
+        "Completed": completed,
+        "Service Name": service,
+        "Location": rng.choice(["Home", "Clinic", "School", "Telehealth"], rows),
+        "Payor": rng.choice(["Medicaid", "Aetna", "BCBS", "Cigna"], rows),
+        "Authorization #": rng.integers(10**7, 10**8, rows),
+        "CPT Code": rng.choice(["97153", "97155", "97156", "97151"], rows),
+        "Modifier": rng.choice(["HN", "HO", ""], rows),
+        "Rate": 15.0,
+        "Billed Amount": units * 15.0,
+        "Place of Service": rng.choice(["12", "11", "03", "02"], rows),
+        "Created By": "aloha.sync",
+        "Created Date": day_labels[rng.integers(0, len(day_labels), rows)],
+        "Signed": rng.choice(["Y", "N"], rows, p=[0.95, 0.05]),
+        "Notes": rng.choice(
+            ["", "Client engaged well; worked on manding and tacting targets.",
+             "Session ended early due to illness.", "Parent present for the last 30 minutes."],
+            rows,
+        ),
+    })
+    return frame
+
+
+def write_export(path, rows, seed=0, **kwargs):
+    # CSVs are written chunk by chunk so 10M-row files don't need 10M rows
+    # in memory; xlsx is capped by Excel's sheet size
+    if str(path).endswith(".xlsx"):
+        if rows > XLSX_MAX_ROWS:
+            raise ValueError(f"xlsx holds at most {XLSX_MAX_ROWS:,} rows")
+        frame = generate_frame(rows, seed=seed, **kwargs)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Appointment Billing")
+        ws.append(list(frame.columns))
+        for row in frame.itertuples(index=False, name=None):
+            ws.append([v.item() if isinstance(v, np.generic) else v for v in row])
+        wb.save(path)
+        return
+
+    sizes = [CHUNK_ROWS] * (rows // CHUNK_ROWS)
+    if rows % CHUNK_ROWS or not sizes:
+        sizes.append(rows % CHUNK_ROWS)
+    for i, n in enumerate(sizes):
+        generate_frame(n, seed=seed + i, **kwargs).to_csv(
+            path, mode="a" if i else "w", header=not i, index=False
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="output .csv or .xlsx")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--staff", type=int, default=200)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--start", default="2024-01", help="first month, YYYY-MM")
+    parser.add_argument("--non-bt-share", type=float, default=0.15,
+                        help="share of rows that are not Direct Service BT")
+    parser.add_argument("--not-completed-share", type=float, default=0.1,
+                        help="share of rows that are not Completed=Yes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_export(
+        args.path, args.rows, seed=args.seed, staff=args.staff, months=args.months,
+        start=args.start, non_bt_share=args.non_bt_share,
+        not_completed_share=args.not_completed_share,
+    )
+    print(f"Wrote {args.rows:,} rows to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import os
+import tempfile
+
+from fulltime_core import (
+    COL_COMPLETED,
+    COL_DATE,
+    COL_SERVICE,
+    COL_STAFF,
+    COL_UNITS,
+    COMPLETED_VALUE,
+    DATE_FORMATS,
+    DATE_SAMPLE_SIZE,
+    EXCEL_EPOCH,
+    EXCEL_SERIAL_MAX,
+    EXCEL_SERIAL_MIN,
+    SERVICE_VALUE,
+    infer_date_format,
+    is_parquet_name,
+    required_cols,
+)
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Characters Python's str.strip() removes that SQL trim() would not
+WHITESPACE = " \t\n\r\x0b\x0c"
+
+# The pandas filter -> normalize -> aggregate as one query: every column is
+# read as text and trimmed/cast here, Excel serial dates take precedence
+# over string formats (as in parse_dates), and unparseable units count as
+# 0 hours. YearMonth is the month key of fulltime_core.month_keys.
+# Dates no format reads have no per-element fallback (pandas' "mixed"
+# parse); they are counted in UnparsedDates, on the group with a NULL month.
+FILTERED_SQL = f"""
+src AS (
+    SELECT
+        CAST("{COL_STAFF}" AS VARCHAR) AS staff,
+        trim(CAST("{COL_DATE}" AS VARCHAR), $ws) AS appt,
+        TRY_CAST(trim(CAST("{COL_UNITS}" AS VARCHAR), $ws) AS DOUBLE) AS units,
+        lower(trim(CAST("{COL_COMPLETED}" AS VARCHAR), $ws)) AS completed,
+        trim(CAST("{COL_SERVICE}" AS VARCHAR), $ws) AS service
+    FROM {{relation}}
+),
+filtered AS (
+    SELECT * FROM src WHERE completed = $completed AND service = $service
+)"""
+
+MONTHLY_TOTALS_SQL = f"""
+WITH {FILTERED_SQL},
+appointments AS (
+    SELECT
+        staff,
+        appt,
+        CASE
+            WHEN TRY_CAST(appt AS DOUBLE) BETWEEN $serial_min AND $serial_max
+                THEN DATE '{EXCEL_EPOCH}' + CAST(floor(TRY_CAST(appt AS DOUBLE)) AS INTEGER)
+            ELSE try_strptime(appt, $formats)
+        END AS appt_date,
+        CASE WHEN units IS NULL OR isnan(units) THEN 0 ELSE units END / 4 AS hours
+    FROM filtered
+)
+SELECT
+    staff AS "{COL_STAFF}",
+    CAST((year(appt_date) - 1970) * 12 + month(appt_date) - 1 AS INTEGER) AS "YearMonth",
+    SUM(hours) AS "Hours",
+    COUNT(*) FILTER (WHERE appt_date IS NULL AND appt <> '') AS "UnparsedDates"
+FROM appointments
+GROUP BY 1, 2
+ORDER BY 1, 2
+"""
+
+# String dates parse_dates would infer a format from: non-serial, non-empty
+DATE_SAMPLE_SQL = f"""
+WITH {FILTERED_SQL}
+SELECT appt
+FROM filtered
+WHERE appt <> ''
+    AND coalesce(TRY_CAST(appt AS DOUBLE) NOT BETWEEN $serial_min AND $serial_max, true)
+LIMIT {DATE_SAMPLE_SIZE}
+"""
+
+
+def relation_sql(file_name):
+    if is_parquet_name(file_name):
+        return "read_parquet($path)"
+    return "read_csv($path, all_varchar = true, header = true)"
+
+
+def duckdb_monthly_totals(file_name, source, date_format=None):
+    """Monthly totals computed by DuckDB straight from a CSV/Parquet file.
+
+    The raw rows never enter pandas; only the staff × month result does.
+    Bytes are spilled to a temporary file first. Rows left out because no
+    format read their Appt. Date are counted in ``attrs["unparsed_date_rows"]``.
+    """
+    if duckdb is None:
+        raise ValueError("The DuckDB engine needs the duckdb package installed")
+
+    if isinstance(source, (bytes, bytearray)):
+        suffix = os.path.splitext(str(file_name))[1]
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            tmp.write(source)
+        try:
+            return duckdb_monthly_totals(file_name, tmp.name, date_format)
+        finally:
+            os.unlink(tmp.name)
+
+    relation = relation_sql(file_name)
+
+    con = duckdb.connect()
+    try:
+        header = [
+            row[0] for row in
+            con.execute(f"DESCRIBE SELECT * FROM {relation}", {"path": str(source)}).fetchall()
+        ]
+        missing = [c for c in required_cols if c not in header]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        params = {
+            "path": str(source),
+            "ws": WHITESPACE,
+            "serial_min": EXCEL_SERIAL_MIN,
+            "serial_max": EXCEL_SERIAL_MAX,
+            "completed": COMPLETED_VALUE,
+            "service": SERVICE_VALUE,
+        }
+        # Without a date_format, try the one a sample suggests first, as
+        # parse_dates would
+        if not date_format:
+            sample = con.execute(DATE_SAMPLE_SQL.format(relation=relation), params).df()
+            date_format = infer_date_format(sample["appt"])
+
+        formats = ([date_format] if date_format else []) + DATE_FORMATS
+        totals = con.execute(
+            MONTHLY_TOTALS_SQL.format(relation=relation), {**params, "formats": formats}
+        ).df()
+    finally:
+        con.close()
+
+    unparsed = int(totals.pop("UnparsedDates").sum())
+    totals = totals.dropna(subset=[COL_STAFF, "YearMonth"]).astype({"YearMonth": "int32"})
+    totals = totals.reset_index(drop=True)
+    totals.attrs["slow_date_rows"] = 0
+    totals.attrs["unparsed_date_rows"] = unparsed
+    return totals
@@ -1,158 +1,547 @@
+import hashlib
+import logging
+from datetime import date
+
 import streamlit as st
-import pandas as pd
-from io import BytesIO
+
+from fulltime_core import (
+    DUCKDB_AUTO_BYTES,
+    ENGINES,
+    FULL_TIME_HOURS,
+    GRANULARITIES,
+    MONTHS_REQUIRED,
+    PAY_PERIOD_DAYS,
+    PAY_PERIOD_START,
+    TIER_STATS,
+    build_hours_matrix,
+    build_staff_index,
+    classify_tiers,
+    compact,
+    create_excel,
+    create_tier_excel,
+    daily_totals,
+    default_tiers,
+    evaluate_months,
+    external_monthly_totals,
+    filter_rows,
+    load,
+    load_exports,
+    month_bounds,
+    month_labels,
+    monthly_totals,
+    normalize,
+    period_hours,
+    project_partial_month,
+    resolve_engine,
+    rolling_windows,
+    staff_drilldown,
+    threshold_sweep,
+    should_stream,
+    stream_monthly_totals,
+)
+from instrumentation import StageLog, size_of
+from monthly_store import DEFAULT_STORE_PATH, MonthlyStore
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
 
 # =====================================================
 # PAGE CONFIG
 # =====================================================
 st.set_page_config(page_title="Full Time BT Monitor", layout="wide")
 st.title("Full Time BT Monitor")
-st.caption("PASS = >130 hours in all 3 selected months (Completed=Yes + Direct Service BT only)")
+st.caption(
+    "PASS = more than the threshold hours in every selected month "
+    "(Completed=Yes + Direct Service BT only)"
+)
 
 # =====================================================
 # UPLOAD
 # =====================================================
-uploaded_file = st.file_uploader(
-    "Upload Aloha Appointment Billing File",
-    type=["csv", "xlsx"]
+uploaded_files = st.file_uploader(
+    "Upload Aloha Appointment Billing File(s)",
+    type=["csv", "xlsx", "parquet"],
+    accept_multiple_files=True,
+    help="Upload one export per region to evaluate them together; appointments "
+    "repeated across files are counted once.",
+)
+uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
+
+date_format = st.sidebar.text_input(
+    "Appt. Date format",
+    placeholder="%m/%d/%Y",
+    help="strftime format of the Appt. Date column. Leave blank to infer it from the file.",
+).strip() or None
+
+engine_choice = st.sidebar.selectbox(
+    "Engine",
+    ENGINES,
+    help="auto uses DuckDB or Polars (when installed) for CSVs over "
+    f"{DUCKDB_AUTO_BYTES // 1024 ** 3} GB and for Parquet files; pandas otherwise.",
+)
+
+use_store = st.sidebar.checkbox(
+    "Keep monthly totals in local store",
+    help=f"Merge each upload's months into {DEFAULT_STORE_PATH} and evaluate "
+    "from the store, so past months never need to be uploaded again.",
 )
+store = MonthlyStore() if use_store else None
+store_version = store.version() if use_store else None
 
-if not uploaded_file:
+if not uploaded_files and not (use_store and store.months().shape[0]):
     st.stop()
 
 # =====================================================
-# LOAD
+# STAGE TIMINGS (optional panel + JSON log lines)
 # =====================================================
-if uploaded_file.name.endswith(".csv"):
-    df = pd.read_csv(uploaded_file)
+show_timings = st.sidebar.checkbox("Show pipeline timings")
+timings_panel = st.sidebar.expander("⏱️ Pipeline timings", expanded=True).empty() if show_timings else None
+
+if uploaded_file:
+    file_bytes = uploaded_file.getvalue()
+    file_hash = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+    source_name = uploaded_file.name
+elif uploaded_files:
+    uploads = [(f.name, f.getvalue()) for f in uploaded_files]
+    # Independent of upload order
+    file_hash = hashlib.blake2b(
+        "".join(sorted(hashlib.blake2b(b, digest_size=16).hexdigest() for _, b in uploads)).encode(),
+        digest_size=16,
+    ).hexdigest()
+    source_name = ", ".join(name for name, _ in uploads)
 else:
-    df = pd.read_excel(uploaded_file)
+    file_bytes = file_hash = None
+    source_name = "store"
+
+stage_log = StageLog(
+    context={"file": source_name, "file_hash": file_hash},
+    on_change=(lambda records: timings_panel.dataframe(records, use_container_width=True))
+    if show_timings else None,
+    measure_memory=show_timings,
+)
 
 # =====================================================
-# REQUIRED COLUMNS
+# LOAD (cached by content hash of the upload)
 # =====================================================
-COL_STAFF = "Staff Name"
-COL_DATE = "Appt. Date"
-COL_UNITS = "Units"
-COL_COMPLETED = "Completed"
-COL_SERVICE = "Service Name"
+# Widget interactions rerun the whole script; keying the parsed frame on the
+# file bytes means the export is only read, filtered and normalized once.
+@st.cache_data(show_spinner="Reading billing file...", max_entries=8)
+def load_upload(file_hash, file_name, file_type, date_format, _file_bytes):
+    with stage_log.stage("load") as s:
+        raw = s.output(load(file_name, _file_bytes))
+    with stage_log.stage("filter", raw) as s:
+        filtered = s.output(filter_rows(raw))
+    with stage_log.stage("normalize", filtered) as s:
+        normalized = s.output(normalize(filtered, date_format))
+    with stage_log.stage("compact", normalized) as s:
+        df = s.output(compact(normalized))
 
-required_cols = [COL_STAFF, COL_DATE, COL_UNITS, COL_COMPLETED, COL_SERVICE]
-missing = [c for c in required_cols if c not in df.columns]
+    # Bytes of the frame as read vs. what is kept for the rest of the session
+    df.attrs["memory_bytes"] = (size_of(raw)[1], size_of(df)[1])
+    return df
 
-if missing:
-    st.error(f"Missing required columns: {missing}")
-    st.stop()
 
-# =====================================================
-# FILTER: Completed = Yes
-# =====================================================
-df[COL_COMPLETED] = df[COL_COMPLETED].astype(str).str.strip().str.lower()
-df = df[df[COL_COMPLETED] == "yes"].copy()
+# Several exports: parsed in parallel, then merged with cross-file
+# duplicates dropped before anything is aggregated
+@st.cache_data(show_spinner="Reading billing files...", max_entries=4)
+def load_uploads(file_hash, date_format, _uploads):
+    with stage_log.stage("load_exports") as s:
+        return s.output(load_exports(_uploads, date_format))
 
-# =====================================================
-# FILTER: Service Name = Direct Service BT
-# =====================================================
-df[COL_SERVICE] = df[COL_SERVICE].astype(str).str.strip()
-df = df[df[COL_SERVICE] == "Direct Service BT"].copy()
 
 # =====================================================
-# NORMALIZE
+# MONTHLY TOTALS
 # =====================================================
-df[COL_DATE] = pd.to_datetime(df[COL_DATE], errors="coerce")
-df = df.dropna(subset=[COL_DATE]).copy()
+@st.cache_data(max_entries=8)
+def cached_monthly_totals(file_hash, date_format, _df):
+    with stage_log.stage("aggregate_monthly", _df) as s:
+        return s.output(monthly_totals(_df))
+
+
+# Rows sorted by staff with per-staff offsets, so a drilldown is a slice.
+# A resource, not data: cache_data would unpickle a copy of every row on
+# each fragment rerun. staff_drilldown only reads it
+@st.cache_resource(max_entries=4)
+def staff_index(file_hash, date_format, _df):
+    with stage_log.stage("staff_index", _df) as s:
+        return s.output(build_staff_index(_df))
+
+
+# Daily pre-aggregate; weeks and pay periods are summed from it, so
+# switching granularity never touches the appointment rows again
+@st.cache_data(max_entries=4)
+def cached_daily_totals(file_hash, date_format, _df):
+    with stage_log.stage("daily_totals", _df) as s:
+        return s.output(daily_totals(_df))
+
+
+@st.cache_data(max_entries=8)
+def hours_matrix(data_key, date_format, _monthly_hours):
+    with stage_log.stage("hours_matrix", _monthly_hours) as s:
+        return s.output(build_hours_matrix(_monthly_hours))
+
+
+@st.cache_data(show_spinner="Streaming billing file...", max_entries=8)
+def cached_stream_totals(file_hash, file_name, file_type, date_format, _file_bytes):
+    with stage_log.stage("stream_monthly_totals") as s:
+        return s.output(stream_monthly_totals(_file_bytes, date_format))
 
-df[COL_UNITS] = pd.to_numeric(df[COL_UNITS], errors="coerce").fillna(0)
 
-# Convert Units → Hours (15 min units)
-df["Hours"] = df[COL_UNITS] / 4
+@st.cache_data(show_spinner="Aggregating billing file...", max_entries=8)
+def cached_engine_totals(file_hash, file_name, date_format, engine, _file_bytes):
+    with stage_log.stage(f"{engine}_monthly_totals") as s:
+        return s.output(external_monthly_totals(engine, file_name, _file_bytes, date_format))
 
-df["YearMonth"] = df[COL_DATE].dt.to_period("M").astype(str)
+
+@st.cache_data(max_entries=4)
+def read_store(store_path, store_version):
+    with stage_log.stage("store_read") as s:
+        return s.output(MonthlyStore(store_path).read())
+
+
+# Appointment rows are only kept on the pandas path; the other engines and
+# the store hold monthly totals only
+df = None
+if uploaded_file:
+    try:
+        engine = resolve_engine(uploaded_file.name, len(file_bytes), engine_choice)
+        if engine != "pandas":
+            monthly_hours = stage_log.cached(
+                f"{engine}_monthly_totals", cached_engine_totals,
+                file_hash, uploaded_file.name, date_format, engine, file_bytes
+            )
+        elif should_stream(uploaded_file.name, len(file_bytes)):
+            monthly_hours = stage_log.cached(
+                "stream_monthly_totals", cached_stream_totals,
+                file_hash, uploaded_file.name, uploaded_file.type, date_format, file_bytes
+            )
+        else:
+            df = stage_log.cached(
+                "load_upload", load_upload,
+                file_hash, uploaded_file.name, uploaded_file.type, date_format, file_bytes
+            )
+            monthly_hours = stage_log.cached(
+                "aggregate_monthly", cached_monthly_totals, file_hash, date_format, df
+            )
+            if show_timings:
+                loaded, kept = df.attrs["memory_bytes"]
+                st.sidebar.caption(
+                    f"Working frame: {loaded / 1024 ** 2:,.1f} MB as loaded → "
+                    f"{kept / 1024 ** 2:,.1f} MB compacted"
+                )
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+elif uploaded_files:
+    # Duplicates can only be found on rows, so merged uploads always take
+    # the pandas path
+    try:
+        for name, data in uploads:
+            resolve_engine(name, len(data), "pandas")
+        engine = "pandas"
+        df = stage_log.cached("load_exports", load_uploads, file_hash, date_format, uploads)
+        monthly_hours = stage_log.cached(
+            "aggregate_monthly", cached_monthly_totals, file_hash, date_format, df
+        )
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
+
+    st.caption(
+        f"Merged {len(uploads)} files; {df.attrs['duplicates_removed']:,} duplicate "
+        "appointment(s) removed."
+    )
+    if df.attrs["dedup_missing_cols"]:
+        st.warning(
+            f"Not every file has {', '.join(df.attrs['dedup_missing_cols'])}, so "
+            "appointments repeated across files could not be told apart and were "
+            "all kept."
+        )
+
+if uploaded_files:
+    slow_date_rows = monthly_hours.attrs.get("slow_date_rows", 0)
+    if slow_date_rows:
+        st.caption(
+            f"{slow_date_rows:,} Appt. Date values did not match the detected "
+            "format and were parsed individually."
+        )
+    # DuckDB/Polars have no per-element fallback for dates no format reads
+    unparsed_date_rows = monthly_hours.attrs.get("unparsed_date_rows", 0)
+    if unparsed_date_rows:
+        st.warning(
+            f"{unparsed_date_rows:,} rows were left out: the {engine} engine could not "
+            "read their Appt. Date. Set the date format or use the pandas engine."
+        )
 
 # =====================================================
-# MONTHLY TOTALS
+# MONTHLY STORE (optional incremental ingest)
 # =====================================================
-monthly_hours = (
-    df.groupby([COL_STAFF, "YearMonth"], as_index=False)["Hours"]
-      .sum()
+# Each upload is merged once per session; months whose checksum is
+# unchanged are skipped, so re-uploading a cumulative export is cheap
+if use_store:
+    if uploaded_files:
+        ingested = st.session_state.setdefault("store_ingested", {})
+        ingest_key = (store.path, file_hash, date_format)
+        if ingest_key not in ingested:
+            with stage_log.stage("store_ingest", monthly_hours):
+                ingested[ingest_key] = store.ingest(monthly_hours, source_name)
+            store_version = store.version()
+        summary = ingested[ingest_key]
+        st.caption(
+            f"Store: {len(summary['added'])} month(s) added, "
+            f"{len(summary['replaced'])} replaced, {len(summary['unchanged'])} unchanged."
+        )
+
+    monthly_hours = stage_log.cached("store_read", read_store, store.path, store_version)
+    data_key = f"store:{store_version}"
+else:
+    data_key = f"{file_hash}:{engine}"
+
+staff_names, all_months, hours = stage_log.cached(
+    "hours_matrix", hours_matrix, data_key, date_format, monthly_hours
 )
 
 # =====================================================
-# MONTH SELECTOR
+# EXCEL EXPORT (cached per upload + month selection)
 # =====================================================
-all_months = sorted(monthly_hours["YearMonth"].unique())
+# Built only when the button is clicked, then reused for the same upload
+# and month selection
+@st.cache_data(max_entries=16)
+def cached_excel(data_key, date_format, months, threshold, _pass_df, _no_pass_df):
+    # Runs on the download thread, so this stage shows up in the JSON log only
+    with stage_log.stage("create_excel", (_pass_df, _no_pass_df)) as s:
+        data = create_excel(_pass_df, _no_pass_df)
+        s.data["mem_mb"] = round(len(data) / 1024 / 1024, 2)
+        return data
 
-default_months = all_months[-3:] if len(all_months) >= 3 else all_months
 
-selected_months = st.multiselect(
-    "Select exactly 3 months to evaluate full-time status",
-    options=all_months,
-    default=default_months
-)
+@st.cache_data(max_entries=16)
+def cached_tier_excel(data_key, date_format, months, tiers, _tiered):
+    with stage_log.stage("create_tier_excel", _tiered) as s:
+        data = create_tier_excel(_tiered)
+        s.data["mem_mb"] = round(len(data) / 1024 / 1024, 2)
+        return data
 
-if len(selected_months) != 3:
-    st.warning("Please select exactly 3 months.")
-    st.stop()
-
-selected_months = sorted(selected_months)
 
 # =====================================================
-# PIVOT TABLE (Month headers with actual hours)
+# RESULTS (isolated rerun scope)
 # =====================================================
-pivot = (
-    monthly_hours[monthly_hours["YearMonth"].isin(selected_months)]
-    .pivot_table(
-        index=COL_STAFF,
-        columns="YearMonth",
-        values="Hours",
-        aggfunc="sum",
-        fill_value=0
+# Changing the mode, window or months reruns only this fragment: the
+# upload, parsing and aggregation above are not run again
+pipeline_stages = len(stage_log.records)
+
+
+@st.fragment
+def results():
+    # Each fragment rerun replaces the previous run's evaluation stages
+    del stage_log.records[pipeline_stages:]
+
+    threshold_col, months_col = st.columns(2)
+    threshold = threshold_col.number_input(
+        "PASS threshold (hours per month)",
+        min_value=0.0, value=float(FULL_TIME_HOURS), step=5.0,
+        help="PASS needs more than this many hours in every month.",
+    )
+    months_required = months_col.number_input(
+        "Months required (window length)", min_value=1, value=MONTHS_REQUIRED
     )
-    .reset_index()
-)
 
-# Ensure selected months exist
-for m in selected_months:
-    if m not in pivot.columns:
-        pivot[m] = 0
+    # Rolling windows (every consecutive N months at once)
+    mode = st.radio(
+        "Evaluation mode",
+        ["Selected months", "Rolling windows", "Projection", "Period totals"],
+        horizontal=True,
+    )
 
-pivot = pivot[[COL_STAFF] + selected_months]
+    if mode == "Rolling windows":
+        window = months_required
+        with stage_log.stage("rolling_windows", hours) as s:
+            rolling = s.output(
+                rolling_windows(staff_names, all_months, hours, window, threshold)
+            )
 
-# =====================================================
-# PASS / NO PASS
-# =====================================================
-pass_mask = (pivot[selected_months] > 130).all(axis=1)
+        st.subheader(f"Full-time status across every {window}-month window")
+        if rolling.empty:
+            st.info(f"The export covers fewer than {window} months.")
+        else:
+            st.dataframe(rolling, use_container_width=True)
+            st.download_button(
+                label="⬇️ Download Rolling Windows",
+                data=rolling.to_csv(index=False).encode("utf-8"),
+                file_name="Full_Time_BT_Rolling_Windows.csv",
+                mime="text/csv"
+            )
+        return
 
-pass_df = pivot[pass_mask].copy()
-pass_df["Status"] = "PASS"
+    # Hours per month, ISO week or pay period
+    if mode == "Period totals":
+        if df is None:
+            st.info("Weekly and pay-period totals need the appointment rows, which are "
+                    "only kept when the pandas engine loads the upload.")
+            return
+        daily = stage_log.cached("daily_totals", cached_daily_totals, file_hash, date_format, df)
 
-no_pass_df = pivot[~pass_mask].copy()
-no_pass_df["Status"] = "NO PASS"
+        granularity = st.radio("Granularity", GRANULARITIES, horizontal=True)
+        pay_period_start, pay_period_days = PAY_PERIOD_START, PAY_PERIOD_DAYS
+        if granularity == "Pay period":
+            start_col, days_col = st.columns(2)
+            pay_period_start = start_col.date_input(
+                "A pay period starts on", value=date.fromisoformat(PAY_PERIOD_START)
+            )
+            pay_period_days = days_col.number_input(
+                "Days per pay period", min_value=1, value=PAY_PERIOD_DAYS
+            )
 
-# =====================================================
-# DISPLAY
-# =====================================================
-st.subheader("✅ PASS (Full-Time BTs)")
-if pass_df.empty:
-    st.info("No BTs met full-time requirement.")
-else:
-    st.dataframe(pass_df, use_container_width=True)
+        with stage_log.stage("period_hours", daily) as s:
+            table = s.output(period_hours(daily, granularity, pay_period_start, pay_period_days))
 
-# =====================================================
-# EXCEL DOWNLOAD (Two Sheets)
-# =====================================================
-def create_excel(pass_df, no_pass_df):
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        pass_df.to_excel(writer, sheet_name="PASS", index=False)
-        no_pass_df.to_excel(writer, sheet_name="NO PASS", index=False)
-    return output.getvalue()
+        heading = {"Month": "month", "ISO week": "ISO week", "Pay period": "pay period"}
+        st.subheader(f"Direct Service BT hours by {heading[granularity]}")
+        st.dataframe(table, use_container_width=True)
+        st.download_button(
+            label=f"⬇️ Download {granularity} Totals",
+            data=table.to_csv(index=False).encode("utf-8"),
+            file_name=f"BT_Hours_by_{granularity.replace(' ', '_')}.csv",
+            mime="text/csv"
+        )
+        return
 
-excel_data = create_excel(pass_df, no_pass_df)
+    # Mid-month projection for the latest (possibly partial) month
+    if mode == "Projection":
+        if not all_months:
+            st.info("The export has no months to project.")
+            return
+        first_day, last_day = month_bounds(all_months[-1])
+        as_of = st.date_input(
+            "Hours logged through",
+            value=min(max(date.today(), first_day), last_day),
+            min_value=first_day, max_value=last_day,
+        )
+        with stage_log.stage("projection", hours) as s:
+            projection = s.output(project_partial_month(
+                staff_names, all_months, hours, as_of, threshold, months_required
+            ))
 
-st.download_button(
-    label="⬇️ Download Full-Time BT",
-    data=excel_data,
-    file_name="Full_Time_BT_List.xlsx",
-    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-)
+        elapsed, total = projection.attrs["business_days"]
+        st.subheader(
+            f"Projected full-time status for {first_day:%Y-%m} "
+            f"({elapsed} of {total} business days elapsed)"
+        )
+        counts = projection["Projection"].value_counts()
+        for col, status in zip(st.columns(3), ["On pace", "At risk", "Unable"]):
+            col.metric(status, int(counts.get(status, 0)))
+        st.dataframe(projection, use_container_width=True)
+        return
+
+    # Month selector
+    default_months = all_months[-months_required:]
+
+    month_names = dict(zip(all_months, month_labels(all_months).tolist()))
+
+    selected_months = st.multiselect(
+        f"Select exactly {months_required} months to evaluate full-time status",
+        options=all_months,
+        default=default_months,
+        format_func=month_names.get,
+    )
+
+    if len(selected_months) != months_required:
+        st.warning(f"Please select exactly {months_required} months.")
+        return
+
+    selected_months = sorted(selected_months)
+
+    # Pivot table + PASS / NO PASS
+    with stage_log.stage("evaluate", hours) as s:
+        pass_df, no_pass_df = s.output(evaluate_months(
+            staff_names, all_months, hours, selected_months, threshold
+        ))
+
+    # Display
+    st.subheader("✅ PASS (Full-Time BTs)")
+    if pass_df.empty:
+        st.info("No BTs met full-time requirement.")
+    else:
+        st.dataframe(pass_df, use_container_width=True)
+
+    # Excel download (two sheets, built on click)
+    # Status tiers from an editable tier table, one sheet per tier
+    with st.expander("🏷️ Status tiers"):
+        st.caption(
+            "Tiers are checked top-down; each BT gets the first tier whose statistic "
+            "over the selected months is above the bound."
+        )
+        tier_rows = st.data_editor(
+            [
+                {"Tier": name, "Statistic": stat, "More than (hours)": bound}
+                for name, stat, bound in default_tiers(threshold)
+            ],
+            num_rows="dynamic",
+            column_config={
+                "Statistic": st.column_config.SelectboxColumn(options=list(TIER_STATS), required=True),
+                "More than (hours)": st.column_config.NumberColumn(required=True),
+            },
+        )
+        tiers = tuple(
+            (row["Tier"], row["Statistic"], row["More than (hours)"])
+            for row in tier_rows if row.get("Tier")
+        )
+        try:
+            with stage_log.stage("classify_tiers", hours) as s:
+                tiered = s.output(classify_tiers(
+                    staff_names, all_months, hours, selected_months, tiers
+                ))
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            counts = tiered["Tier"].value_counts(sort=False)
+            for col, (tier, n) in zip(st.columns(len(counts)), counts.items()):
+                col.metric(tier, int(n))
+            st.dataframe(tiered, use_container_width=True)
+
+            tier_key = (data_key, date_format, tuple(selected_months), tiers)
+            st.download_button(
+                label="⬇️ Download by Tier",
+                data=lambda: cached_tier_excel(*tier_key, tiered),
+                file_name="Full_Time_BT_Tiers.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                on_click="ignore"
+            )
+
+    # Per-staff drilldown: daily / weekly hours and appointment rows
+    with st.expander("🔎 Staff drilldown"):
+        if df is None:
+            st.info("Appointment rows are only kept when the pandas engine loads the upload.")
+        else:
+            index = stage_log.cached("staff_index", staff_index, file_hash, date_format, df)
+            staff_name = st.selectbox("Staff member", index[1], index=None)
+            if staff_name is not None:
+                with stage_log.stage("staff_drilldown") as s:
+                    rows, daily, weekly = s.output(
+                        staff_drilldown(index, staff_name, selected_months)
+                    )
+                st.bar_chart(daily, x="Date", y="Hours")
+                weekly_col, rows_col = st.columns([1, 2])
+                weekly_col.dataframe(weekly, hide_index=True, use_container_width=True)
+                rows_col.dataframe(rows, hide_index=True, use_container_width=True)
+
+    # Threshold sweep: PASS counts from 80 to 180 hours for these months
+    with st.expander("📈 Threshold sweep"):
+        with stage_log.stage("threshold_sweep", hours) as s:
+            sweep = s.output(
+                threshold_sweep(staff_names, all_months, hours, selected_months)
+            )
+        st.line_chart(sweep, x="Threshold", y="PASS")
+        st.dataframe(sweep, hide_index=True, use_container_width=True)
+
+    export_key = (data_key, date_format, tuple(selected_months), threshold)
+
+    st.download_button(
+        label="⬇️ Download Full-Time BT",
+        data=lambda: cached_excel(*export_key, pass_df, no_pass_df),
+        file_name="Full_Time_BT_List.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        on_click="ignore"
+    )
+
+
+results()
@@ -0,0 +1,199 @@
+"""Batch full-time BT evaluation over Aloha Appointment Billing exports.
+
+Runs the same load -> filter -> normalize -> aggregate -> evaluate pipeline
+as the Streamlit page and writes one PASS/NO PASS file per export:
+
+    python fulltime_cli.py east.csv west.xlsx --months 2024-10 2024-11 2024-12
+    python fulltime_cli.py exports/*.csv --out-dir results --format csv --jobs 0
+    python fulltime_cli.py east.csv west.csv --merge     # one report, duplicates dropped
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from fulltime_core import (
+    ENGINES,
+    FULL_TIME_HOURS,
+    MONTHS_REQUIRED,
+    build_hours_matrix,
+    choose_months,
+    create_excel,
+    evaluate_months,
+    load_exports,
+    month_labels,
+    monthly_totals,
+    run_pipeline,
+)
+
+
+def month_arg(value):
+    try:
+        return pd.Period(value, freq="M").strftime("%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a YYYY-MM month: {value!r}")
+
+
+def positive_int(value):
+    try:
+        n = int(value)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"not a whole number of at least 1: {value!r}")
+    return n
+
+
+def write_result(out, pass_df, no_pass_df, fmt):
+    if fmt == "xlsx":
+        out.write_bytes(create_excel(pass_df, no_pass_df))
+    else:
+        pd.concat([pass_df, no_pass_df], ignore_index=True).to_csv(out, index=False)
+
+
+def output_paths(paths, out_dir, fmt):
+    """One result path per export, unique even when file names repeat.
+
+    Repeated stems are prefixed with their parent directory (east/export.csv
+    -> east_export_full_time.csv), and numbered if that still collides.
+    """
+    stems = [p.stem for p in paths]
+    names = [
+        f"{p.parent.resolve().name}_{p.stem}" if stems.count(p.stem) > 1 else p.stem
+        for p in paths
+    ]
+    outs = []
+    for i, name in enumerate(names):
+        if names.count(name) > 1:
+            name = f"{name}_{names[:i].count(name) + 1}"
+        outs.append(out_dir / f"{name}_full_time.{fmt}")
+    return outs
+
+
+def evaluate_file(path, months, months_required, threshold, date_format, engine, out, fmt):
+    selected, pass_df, no_pass_df = run_pipeline(
+        path.name, path, months, threshold, date_format, engine, months_required
+    )
+
+    write_result(out, pass_df, no_pass_df, fmt)
+    return out, selected, len(pass_df), len(no_pass_df)
+
+
+def evaluate_merged(paths, months, months_required, threshold, date_format, jobs, out_dir, fmt):
+    # Always the pandas path: duplicates are found on rows, not totals
+    merged = load_exports([(p.name, p) for p in paths], date_format, jobs)
+    staff, all_months, hours = build_hours_matrix(monthly_totals(merged))
+
+    selected = choose_months(all_months, months, months_required)
+    pass_df, no_pass_df = evaluate_months(staff, all_months, hours, selected, threshold)
+
+    out = out_dir / f"merged_full_time.{fmt}"
+    write_result(out, pass_df, no_pass_df, fmt)
+    return (
+        out, month_labels(selected).tolist(), len(pass_df), len(no_pass_df),
+        merged.attrs["duplicates_removed"], merged.attrs["dedup_missing_cols"],
+    )
+
+
+def run_file(task_args):
+    # Errors are reported per file so one bad export doesn't stop the batch
+    path = task_args[0]
+    try:
+        return path, evaluate_file(*task_args), None
+    except (OSError, ValueError) as e:
+        return path, None, e
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Evaluate full-time BT status for Aloha billing exports."
+    )
+    parser.add_argument("files", nargs="+", type=Path, help="CSV, xlsx or Parquet exports")
+    parser.add_argument(
+        "--months", nargs="+", type=month_arg,
+        help="YYYY-MM months to evaluate, exactly --months-required of them "
+        "(default: the last ones in each file)",
+    )
+    parser.add_argument(
+        "--months-required", type=positive_int, default=MONTHS_REQUIRED,
+        help=f"PASS needs this many months over the threshold (default: {MONTHS_REQUIRED})",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=FULL_TIME_HOURS,
+        help=f"PASS needs more than this many hours in every month (default: {FULL_TIME_HOURS})",
+    )
+    parser.add_argument("--date-format", help="strftime format of Appt. Date (default: infer)")
+    parser.add_argument(
+        "--engine", choices=ENGINES, default="auto",
+        help="aggregation engine; auto uses DuckDB/Polars for very large CSV/Parquet (default: auto)",
+    )
+    parser.add_argument(
+        "--merge", action="store_true",
+        help="evaluate all files as one export, counting appointments repeated "
+        "across files once (always uses the pandas engine)",
+    )
+    parser.add_argument("--out-dir", type=Path, default=Path("."))
+    parser.add_argument("--format", choices=["xlsx", "csv"], default="xlsx")
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="files to process in parallel; 0 uses every CPU core (default: 1)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = args.jobs or os.cpu_count() or 1
+
+    if args.merge:
+        try:
+            out, selected, n_pass, n_no_pass, n_dup, missing = evaluate_merged(
+                args.files, args.months, args.months_required, args.threshold,
+                args.date_format, jobs,
+                args.out_dir, args.format,
+            )
+        except (OSError, ValueError) as e:
+            print(f"merge: {e}", file=sys.stderr)
+            return 1
+        if missing:
+            print(
+                f"merge: not every file has {', '.join(missing)}; duplicate "
+                "appointments were not removed",
+                file=sys.stderr,
+            )
+        print(
+            f"{len(args.files)} files ({n_dup} duplicate appointments removed): "
+            f"{', '.join(selected)} -> {n_pass} PASS, {n_no_pass} NO PASS ({out})"
+        )
+        return 0
+
+    task_args = [
+        (path, args.months, args.months_required, args.threshold, args.date_format,
+         args.engine, out, args.format)
+        for path, out in zip(args.files, output_paths(args.files, args.out_dir, args.format))
+    ]
+
+    if jobs == 1 or len(task_args) == 1:
+        results = [run_file(a) for a in task_args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(task_args))) as pool:
+            results = list(pool.map(run_file, task_args))
+
+    failed = 0
+    for path, result, error in results:
+        if error is not None:
+            failed += 1
+            print(f"{path}: {error}", file=sys.stderr)
+            continue
+        out, selected, n_pass, n_no_pass = result
+        print(f"{path}: {', '.join(selected)} -> {n_pass} PASS, {n_no_pass} NO PASS ({out})")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
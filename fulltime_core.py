@@ -0,0 +1,833 @@
+"""Full-time BT evaluation pipeline, free of any Streamlit calls.
+
+Stages, each usable on its own:
+
+    load -> filter_rows -> normalize -> compact -> aggregate_monthly
+         -> build_hours_matrix -> evaluate_months -> create_excel
+
+`run_pipeline` chains them for one export. Sources are raw bytes or file
+paths. Very large CSV/Parquet exports can be aggregated by DuckDB or Polars
+instead (see duckdb_engine.py, polars_engine.py). The Streamlit page
+(fulltime.py) and the batch CLI (fulltime_cli.py) are thin shells over
+these functions.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
+from os import PathLike
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from pandas.tseries.api import guess_datetime_format
+
+from xlsx_io import as_source, read_xlsx, read_xlsx_header, write_xlsx, write_xlsx_by
+
+__all__ = [
+    "COL_STAFF", "COL_DATE", "COL_UNITS", "COL_COMPLETED", "COL_SERVICE",
+    "required_cols", "FULL_TIME_HOURS", "MONTHS_REQUIRED",
+    "month_key", "month_keys", "month_labels", "month_bounds",
+    "load", "filter_rows", "normalize", "compact", "prepare", "load_exports",
+    "aggregate_monthly",
+    "monthly_totals", "stream_monthly_totals", "load_monthly_totals",
+    "daily_totals", "period_hours",
+    "resolve_engine", "external_monthly_totals",
+    "build_hours_matrix", "choose_months", "evaluate_months", "threshold_sweep", "rolling_windows",
+    "project_partial_month", "default_tiers", "classify_tiers",
+    "build_staff_index", "staff_drilldown",
+    "create_excel", "create_tier_excel", "run_pipeline",
+]
+
+# =====================================================
+# REQUIRED COLUMNS
+# =====================================================
+COL_STAFF = "Staff Name"
+COL_DATE = "Appt. Date"
+COL_UNITS = "Units"
+COL_COMPLETED = "Completed"
+COL_SERVICE = "Service Name"
+
+required_cols = [COL_STAFF, COL_DATE, COL_UNITS, COL_COMPLETED, COL_SERVICE]
+
+# Together with staff, date and units these identify one appointment when
+# the same rows show up in several exports; without all of them in every
+# file no duplicates are dropped
+APPOINTMENT_KEY_COLS = ["Client Name", "Start Time", "End Time"]
+
+COMPLETED_VALUE = "yes"
+SERVICE_VALUE = "Direct Service BT"
+
+# PASS = more than FULL_TIME_HOURS in each of MONTHS_REQUIRED months
+FULL_TIME_HOURS = 130
+MONTHS_REQUIRED = 3
+
+# Thresholds (hours) covered by threshold_sweep
+SWEEP_THRESHOLDS = np.arange(80, 181)
+
+# Status tiers, checked top-down as (tier, statistic, more than hours): a
+# staff member gets the first tier whose statistic over the selected
+# months ("min" = weakest month, "mean" = average month) is above the
+# bound, and DEFAULT_TIER when none is
+TIER_STATS = ("min", "mean")
+DEFAULT_TIER = "Inactive"
+
+# Granularities of period_hours. Pay periods are PAY_PERIOD_DAYS long and
+# aligned to PAY_PERIOD_START (the first day of any pay period)
+GRANULARITIES = ("Month", "ISO week", "Pay period")
+PAY_PERIOD_START = "2024-01-01"
+PAY_PERIOD_DAYS = 14
+
+# Most direct-service hours a BT can log per business day; used to tell
+# "at risk" from "unable" in project_partial_month
+MAX_DAILY_HOURS = 8
+
+# CSVs larger than this are streamed in chunks into the monthly totals
+# instead of being materialized as one DataFrame. The page only sees
+# uploads this large because .streamlit/config.toml raises Streamlit's
+# 200 MB maxUploadSize
+STREAM_CSV_BYTES = 200 * 1024 * 1024
+CSV_CHUNK_ROWS = 250_000
+
+# "auto" hands CSVs above this size (and all Parquet files) to DuckDB, or
+# Polars, when installed, so raw rows never load into pandas
+ENGINES = ("auto", "pandas", "duckdb", "polars")
+EXTERNAL_ENGINES = ("duckdb", "polars")
+DUCKDB_AUTO_BYTES = 1024 * 1024 * 1024
+
+
+# =====================================================
+# LOAD
+# =====================================================
+def is_csv_name(file_name):
+    return str(file_name).lower().endswith(".csv")
+
+
+def is_parquet_name(file_name):
+    return str(file_name).lower().endswith(".parquet")
+
+
+def check_columns(is_csv, source):
+    # Read the header only so a bad export fails before the full parse
+    if is_csv:
+        header = pd.read_csv(as_source(source), nrows=0).columns
+    else:
+        header = read_xlsx_header(source)
+
+    missing = [c for c in required_cols if c not in header]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+    return header
+
+
+def load(file_name, source, extra_cols=()):
+    """Read the required columns of a CSV/xlsx export, unfiltered.
+
+    ``extra_cols`` are read too when the export has them. Raises
+    ValueError when a required column is missing.
+    """
+    is_csv = is_csv_name(file_name)
+    header = check_columns(is_csv, source)
+
+    # Exports carry 40+ columns (incl. free-text notes); parse only ours
+    usecols = required_cols + [c for c in extra_cols if c in header]
+    if is_csv:
+        return pd.read_csv(as_source(source), usecols=usecols)
+    return read_xlsx(source, usecols)
+
+
+# =====================================================
+# FILTER: Completed = Yes AND Service Name = Direct Service BT
+# =====================================================
+def normalized_equals(col, target, lower=False):
+    # Both filter columns hold only a handful of distinct values, so the
+    # string work runs once per unique and is mapped back through the codes
+    codes, uniques = pd.factorize(col, use_na_sentinel=False)
+    values = pd.Index(uniques).astype(str).str.strip()
+    if lower:
+        values = values.str.lower()
+    return (values == target)[codes]
+
+
+def filter_rows(df):
+    """Keep completed Direct Service BT appointments."""
+    mask = (
+        normalized_equals(df[COL_COMPLETED], COMPLETED_VALUE, lower=True)
+        & normalized_equals(df[COL_SERVICE], SERVICE_VALUE)
+    )
+    return df[mask]
+
+
+# =====================================================
+# NORMALIZE
+# =====================================================
+# Formats tried (alongside pandas' own guess) when inferring the Appt. Date
+# format from a sample of the column
+DATE_FORMATS = [
+    "%m/%d/%Y",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%y",
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+]
+DATE_SAMPLE_SIZE = 500
+
+# Excel serial day numbers for 1900-01-01 .. 9999-12-31
+EXCEL_EPOCH = "1899-12-30"
+EXCEL_SERIAL_MIN = 1
+EXCEL_SERIAL_MAX = 2958465
+
+
+def from_excel_serial(serial):
+    return pd.to_datetime(serial, unit="D", origin=EXCEL_EPOCH)
+
+
+def infer_date_format(values):
+    if values.empty:
+        return None
+
+    sample = values.sample(n=min(len(values), DATE_SAMPLE_SIZE), random_state=0)
+    sample = sample.astype(str).str.strip()
+
+    candidates = list(DATE_FORMATS)
+    for v in sample.head(5):
+        guess = guess_datetime_format(v)
+        if guess and guess not in candidates:
+            candidates.insert(0, guess)
+
+    best, best_hits = None, 0
+    for fmt in candidates:
+        hits = pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum()
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+    return best
+
+
+def parse_dates(col, date_format=None):
+    # Returns the parsed column and how many rows needed the slow parser
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col, 0
+    if pd.api.types.is_numeric_dtype(col):
+        return from_excel_serial(col.where(col.between(EXCEL_SERIAL_MIN, EXCEL_SERIAL_MAX))), 0
+
+    parsed = pd.Series(pd.NaT, index=col.index, dtype="datetime64[ns]")
+
+    # Excel serial-number dates mixed in with the strings
+    serial = pd.to_numeric(col, errors="coerce")
+    is_serial = serial.between(EXCEL_SERIAL_MIN, EXCEL_SERIAL_MAX)
+    if is_serial.any():
+        parsed[is_serial] = from_excel_serial(serial[is_serial]).to_numpy()
+
+    # One vectorized pass with a single known format
+    rest = ~is_serial & col.notna()
+    fmt = date_format or infer_date_format(col[rest])
+    if fmt:
+        parsed[rest] = pd.to_datetime(col[rest], format=fmt, errors="coerce").to_numpy()
+
+    # Only what that format could not read goes to per-element parsing
+    failed = rest & parsed.isna()
+    slow_rows = int(failed.sum())
+    if slow_rows:
+        parsed[failed] = pd.to_datetime(
+            col[failed], format="mixed", errors="coerce"
+        ).to_numpy()
+    return parsed, slow_rows
+
+
+# =====================================================
+# MONTH KEYS
+# =====================================================
+# YearMonth is an int32 count of months since 1970-01 (the same ordinal as
+# pd.Period(freq="M")); the "YYYY-MM" label is only built for display and
+# export, never per row
+def month_keys(dates):
+    return np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[M]").astype(np.int32)
+
+
+def month_labels(keys):
+    """ "YYYY-MM" labels for an array of month keys."""
+    return np.asarray(keys, dtype=np.int64).astype("datetime64[M]").astype(str)
+
+
+def month_key(label):
+    """Month key of a "YYYY-MM" label (or anything pd.Period accepts)."""
+    return int(pd.Period(label, freq="M").ordinal)
+
+
+def month_bounds(key):
+    """First and last day of a month key, as datetime.date."""
+    period = pd.Period(ordinal=key, freq="M")
+    return period.start_time.date(), period.end_time.date()
+
+
+def normalize(df, date_format=None):
+    """Parse dates and Units, derive the YearMonth key (returns a new frame).
+
+    Rows without a usable Appt. Date are dropped. The count of dates that
+    needed per-element parsing is kept in ``attrs["slow_date_rows"]``.
+    """
+    dates, slow_rows = parse_dates(df[COL_DATE], date_format)
+    keep = dates.notna().to_numpy()
+
+    df = df[keep].copy()
+    df[COL_DATE] = dates[keep]
+    df.attrs["slow_date_rows"] = slow_rows
+
+    df[COL_UNITS] = pd.to_numeric(df[COL_UNITS], errors="coerce").fillna(0)
+    df["YearMonth"] = month_keys(df[COL_DATE])
+    return df
+
+
+# =====================================================
+# COMPACT
+# =====================================================
+def compact(df):
+    """Keep only the columns later stages use, in compact dtypes.
+
+    Staff Name and the appointment key columns become categoricals and
+    integral Units the smallest integer dtype that holds them; Hours are
+    derived per staff × month in aggregate_monthly, not per row.
+    """
+    text_cols = [COL_STAFF] + [c for c in APPOINTMENT_KEY_COLS if c in df.columns]
+    out = df[[COL_DATE, COL_UNITS, "YearMonth"] + text_cols]
+    out = out.astype({c: "category" for c in text_cols})
+    # Left as float64 when an export has fractional units
+    out[COL_UNITS] = pd.to_numeric(out[COL_UNITS], downcast="integer")
+    out.attrs = dict(df.attrs)
+    return out[[COL_STAFF, COL_DATE, COL_UNITS, "YearMonth"] + text_cols[1:]]
+
+
+def prepare(df, date_format=None):
+    """filter_rows, normalize and compact."""
+    return compact(normalize(filter_rows(df), date_format))
+
+
+# =====================================================
+# MERGE (one export per region)
+# =====================================================
+def load_export(file_name, source, date_format=None):
+    return prepare(load(file_name, source, APPOINTMENT_KEY_COLS), date_format)
+
+
+def drop_duplicate_appointments(frames):
+    """Concatenate normalized exports, dropping rows repeated across files.
+
+    A row is identified by a vectorized hash of staff, date, units and the
+    APPOINTMENT_KEY_COLS. Identical rows within one file are kept: only
+    copies beyond a file's own count are dropped. When any file lacks a
+    key column nothing is dropped, since staff, date and units alone would
+    merge different appointments; the missing columns are listed in
+    ``attrs["dedup_missing_cols"]``.
+    """
+    missing = [c for c in APPOINTMENT_KEY_COLS if not all(c in f.columns for f in frames)]
+    key_cols = [COL_STAFF, COL_DATE, COL_UNITS] + (APPOINTMENT_KEY_COLS if not missing else [])
+    df = pd.concat([f[key_cols + ["YearMonth"]] for f in frames], ignore_index=True)
+
+    if missing:
+        keep = np.ones(len(df), dtype=bool)
+    else:
+        hashes = pd.util.hash_pandas_object(df[key_cols], index=False).to_numpy()
+        file_ids = np.repeat(np.arange(len(frames)), [len(f) for f in frames])
+        # n-th copy of a row inside its own file, so a row appearing twice in
+        # one export and twice in another is kept twice, not once
+        occurrence = pd.DataFrame({"hash": hashes, "file": file_ids}).groupby(
+            ["hash", "file"], sort=False
+        ).cumcount().to_numpy()
+        keep = ~pd.DataFrame({"hash": hashes, "n": occurrence}).duplicated().to_numpy()
+
+    # Categories differ per file, so the concatenated text columns are
+    # plain strings again until compacted once more
+    merged = compact(df[keep].reset_index(drop=True))
+    merged.attrs["slow_date_rows"] = sum(f.attrs.get("slow_date_rows", 0) for f in frames)
+    merged.attrs["duplicates_removed"] = int(len(df) - keep.sum())
+    merged.attrs["dedup_missing_cols"] = missing
+    return merged
+
+
+def load_exports(files, date_format=None, jobs=None):
+    """Load and merge several (file_name, source) exports.
+
+    Files are parsed in parallel worker processes (``jobs`` of them, all
+    cores by default); see drop_duplicate_appointments for the merge.
+    """
+    names, sources = zip(*files)
+    jobs = min(jobs or os.cpu_count() or 1, len(files))
+    if jobs == 1:
+        frames = [load_export(n, s, date_format) for n, s in files]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            frames = list(pool.map(load_export, names, sources, [date_format] * len(files)))
+    return drop_duplicate_appointments(frames)
+
+
+# =====================================================
+# MONTHLY TOTALS
+# =====================================================
+def sum_units(df):
+    # Integer Units add up exactly, so partial sums can be folded together
+    return df.groupby([COL_STAFF, "YearMonth"], as_index=False, observed=True)[COL_UNITS].sum()
+
+
+def units_to_hours(totals):
+    # Convert Units → Hours (15 min units), once per staff × month
+    hours = totals[COL_UNITS] / 4
+    return totals.drop(columns=COL_UNITS).assign(Hours=hours)
+
+
+def aggregate_monthly(df):
+    """Hours per (Staff Name, YearMonth) from a compacted frame."""
+    return units_to_hours(sum_units(df))
+
+
+def monthly_totals(df):
+    """aggregate_monthly, carrying over the slow-date count."""
+    totals = aggregate_monthly(df)
+    totals.attrs["slow_date_rows"] = df.attrs.get("slow_date_rows", 0)
+    return totals
+
+
+def stream_monthly_totals(source, date_format=None):
+    """Monthly totals of a CSV read in CSV_CHUNK_ROWS-row chunks."""
+    check_columns(True, source)
+
+    # Fold each chunk's staff×month sums into a running total so peak
+    # memory follows CSV_CHUNK_ROWS, not the size of the export
+    totals = None
+    slow_rows = 0
+    chunks = pd.read_csv(
+        as_source(source), usecols=required_cols, chunksize=CSV_CHUNK_ROWS
+    )
+    for chunk in chunks:
+        chunk = prepare(chunk, date_format)
+        slow_rows += chunk.attrs["slow_date_rows"]
+        part = sum_units(chunk)
+        if totals is not None:
+            part = sum_units(pd.concat([totals, part], ignore_index=True))
+        totals = part
+
+    if totals is None:
+        totals = pd.DataFrame({COL_STAFF: [], "YearMonth": [], "Hours": []})
+    else:
+        totals = units_to_hours(totals)
+    totals.attrs["slow_date_rows"] = slow_rows
+    return totals
+
+
+# =====================================================
+# WEEKLY / PAY-PERIOD TOTALS
+# =====================================================
+def daily_totals(df):
+    """Units per (Staff Name, Day) of a compacted frame.
+
+    Day counts days since 1970-01-01. Every granularity in period_hours is
+    aggregated from this, so the rows are only grouped once.
+    """
+    day = df[COL_DATE].to_numpy().astype("datetime64[D]").astype(np.int32)
+    return df.groupby(
+        [df[COL_STAFF], pd.Series(day, index=df.index, name="Day")], observed=True
+    )[COL_UNITS].sum().reset_index()
+
+
+def period_keys(days, granularity, pay_period_start=PAY_PERIOD_START, pay_period_days=PAY_PERIOD_DAYS):
+    # Integer period of each day number
+    if granularity == "Month":
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int32)
+    if granularity == "ISO week":
+        # Weeks since Monday 1969-12-29 (day -3)
+        return (days + 3) // 7
+    if granularity == "Pay period":
+        anchor = np.datetime64(pay_period_start, "D").astype(np.int64)
+        return (days - anchor) // pay_period_days
+    raise ValueError(f"Unknown granularity {granularity!r}; expected one of {GRANULARITIES}")
+
+
+def period_labels(keys, granularity, pay_period_start=PAY_PERIOD_START, pay_period_days=PAY_PERIOD_DAYS):
+    # Labels for the (few) distinct period keys, never per row
+    if granularity == "Month":
+        return month_labels(keys).tolist()
+    if granularity == "ISO week":
+        iso = pd.DatetimeIndex((keys * 7 - 3).astype("datetime64[D]")).isocalendar()
+        return [f"{y}-W{w:02d}" for y, w in zip(iso["year"], iso["week"])]
+    anchor = np.datetime64(pay_period_start, "D")
+    starts = anchor + keys * pay_period_days
+    return [f"{s} → {s + pay_period_days - 1}" for s in starts]
+
+
+def period_hours(daily, granularity="Month", pay_period_start=PAY_PERIOD_START,
+                 pay_period_days=PAY_PERIOD_DAYS):
+    """Staff × period hours table from daily_totals.
+
+    ``granularity`` is one of GRANULARITIES; periods without appointments
+    show 0 hours.
+    """
+    keys = period_keys(daily["Day"].to_numpy(), granularity, pay_period_start, pay_period_days)
+    staff_codes, staff = pd.factorize(daily[COL_STAFF], sort=True)
+    period_codes, periods = pd.factorize(keys, sort=True)
+
+    # Units into a dense staff × period grid, then Hours once per cell
+    units = np.zeros((len(staff), len(periods)))
+    np.add.at(units, (staff_codes, period_codes), daily[COL_UNITS].to_numpy(dtype=float))
+
+    table = pd.DataFrame(
+        units / 4,
+        columns=period_labels(np.asarray(periods), granularity, pay_period_start, pay_period_days),
+    )
+    table.insert(0, COL_STAFF, np.asarray(staff, dtype=object))
+    return table
+
+
+def should_stream(file_name, size):
+    return is_csv_name(file_name) and size > STREAM_CSV_BYTES
+
+
+def source_size(source):
+    if isinstance(source, (str, PathLike)):
+        return Path(source).stat().st_size
+    return len(source)
+
+
+def resolve_engine(file_name, size, engine="auto"):
+    """Pick "pandas", "duckdb" or "polars".
+
+    "auto" hands very large CSVs and Parquet files to DuckDB, or Polars
+    when only that is installed, and everything else to pandas.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {ENGINES}")
+
+    installed = [e for e in EXTERNAL_ENGINES if find_spec(e) is not None]
+    columnar = is_csv_name(file_name) or is_parquet_name(file_name)
+
+    if engine == "auto":
+        large = size > DUCKDB_AUTO_BYTES or is_parquet_name(file_name)
+        engine = installed[0] if installed and columnar and large else "pandas"
+    elif engine in EXTERNAL_ENGINES:
+        if engine not in installed:
+            raise ValueError(f"The {engine} engine needs the {engine} package installed")
+        if not columnar:
+            raise ValueError(f"The {engine} engine reads CSV or Parquet exports only")
+
+    if engine == "pandas" and is_parquet_name(file_name):
+        raise ValueError("Parquet exports need the duckdb or polars engine")
+    return engine
+
+
+def external_monthly_totals(engine, file_name, source, date_format=None):
+    """Monthly totals from the DuckDB or Polars engine."""
+    # Imported here: both engine modules build their queries from this one
+    if engine == "duckdb":
+        from duckdb_engine import duckdb_monthly_totals
+        return duckdb_monthly_totals(file_name, source, date_format)
+    from polars_engine import polars_monthly_totals
+    return polars_monthly_totals(file_name, source, date_format)
+
+
+def load_monthly_totals(file_name, source, date_format=None, engine="auto"):
+    """Load through monthly totals with the chosen engine.
+
+    Large CSVs on the pandas engine are streamed in chunks.
+    """
+    size = source_size(source)
+    engine = resolve_engine(file_name, size, engine)
+    if engine != "pandas":
+        return external_monthly_totals(engine, file_name, source, date_format)
+
+    if should_stream(file_name, size):
+        return stream_monthly_totals(source, date_format)
+    return monthly_totals(prepare(load(file_name, source), date_format))
+
+
+# =====================================================
+# STAFF × MONTH MATRIX
+# =====================================================
+def build_hours_matrix(monthly_hours):
+    """Return (staff names, sorted month keys, staff × month hours array)."""
+    # Dense staff × month hours; NaN marks months a staff member has no
+    # appointments in, so they can be told apart from a real 0
+    staff_codes, staff = pd.factorize(monthly_hours[COL_STAFF], sort=True)
+    month_codes, months = pd.factorize(monthly_hours["YearMonth"], sort=True)
+
+    matrix = np.full((len(staff), len(months)), np.nan)
+    matrix[staff_codes, month_codes] = monthly_hours["Hours"].to_numpy(dtype=float)
+    return np.asarray(staff, dtype=object), months.tolist(), matrix
+
+
+def rolling_windows(staff, months, matrix, window, threshold=FULL_TIME_HOURS):
+    """PASS grid for every consecutive `window`-month calendar window."""
+    # Every consecutive calendar window; months missing from the export
+    # count as 0 hours rather than being skipped over
+    if not months:
+        return pd.DataFrame(columns=[COL_STAFF])
+    calendar = month_labels(np.arange(months[0], months[-1] + 1))
+    dense = np.zeros((len(staff), len(calendar)))
+    dense[:, np.asarray(months) - months[0]] = np.nan_to_num(matrix)
+
+    if len(calendar) < window:
+        return pd.DataFrame(columns=[COL_STAFF])
+
+    # Sliding minimum: a window passes when its weakest month clears the bar
+    window_min = sliding_window_view(dense, window, axis=1).min(axis=2)
+    grid = window_min > threshold
+    labels = [
+        f"{calendar[i]} → {calendar[i + window - 1]}"
+        for i in range(grid.shape[1])
+    ]
+
+    any_pass = grid.any(axis=1)
+    first = grid.argmax(axis=1)
+    last = grid.shape[1] - 1 - grid[:, ::-1].argmax(axis=1)
+    label_arr = np.asarray(labels, dtype=object)
+
+    result = pd.DataFrame({
+        COL_STAFF: staff,
+        "Windows Passed": grid.sum(axis=1),
+        "First Qualifying Window": np.where(any_pass, label_arr[first], None),
+        "Last Qualifying Window": np.where(any_pass, label_arr[last], None),
+    })
+    return pd.concat([result, pd.DataFrame(grid, columns=labels)], axis=1)
+
+
+# =====================================================
+# PASS / NO PASS
+# =====================================================
+def select_months(staff, months, matrix, selected_months, active_only=True):
+    # (staff, hours) of staff with appointments in at least one selected
+    # month (or everyone); months absent from the export have no hours
+    month_pos = {m: i for i, m in enumerate(months)}
+    selected_hours = np.full((len(staff), len(selected_months)), np.nan)
+    for j, m in enumerate(selected_months):
+        if m in month_pos:
+            selected_hours[:, j] = matrix[:, month_pos[m]]
+
+    if not active_only:
+        return staff, np.nan_to_num(selected_hours)
+    active = ~np.isnan(selected_hours).all(axis=1)
+    return staff[active], np.nan_to_num(selected_hours[active])
+
+
+def choose_months(all_months, months=None, months_required=MONTHS_REQUIRED):
+    """Month keys to evaluate: ``months`` ("YYYY-MM" labels) if given, else
+    the last ``months_required`` of the export.
+
+    Raises ValueError unless that is exactly ``months_required`` months,
+    as the page requires, or when ``months_required`` is below 1.
+    """
+    if months_required < 1:
+        raise ValueError(f"At least 1 month is required, got {months_required}")
+    if months:
+        selected = sorted(set(map(month_key, months)))
+        if len(selected) != months_required:
+            raise ValueError(
+                f"Expected exactly {months_required} months, got {len(selected)}"
+            )
+        return selected
+
+    if len(all_months) < months_required:
+        raise ValueError(
+            f"The export covers {len(all_months)} month(s); {months_required} are required"
+        )
+    return all_months[-months_required:]
+
+
+def evaluate_months(staff, months, matrix, selected_months, threshold=FULL_TIME_HOURS):
+    """Split staff into PASS / NO PASS frames for the selected month keys.
+
+    Month columns are labelled "YYYY-MM".
+    """
+    active_staff, selected_hours = select_months(staff, months, matrix, selected_months)
+
+    pivot = pd.DataFrame(selected_hours, columns=month_labels(selected_months).tolist())
+    pivot.insert(0, COL_STAFF, active_staff)
+
+    pass_mask = (selected_hours > threshold).all(axis=1)
+
+    pass_df = pivot[pass_mask].copy()
+    pass_df["Status"] = "PASS"
+
+    no_pass_df = pivot[~pass_mask].copy()
+    no_pass_df["Status"] = "NO PASS"
+    return pass_df, no_pass_df
+
+
+def threshold_sweep(staff, months, matrix, selected_months, thresholds=SWEEP_THRESHOLDS):
+    """How many staff would PASS the selected months at each threshold."""
+    # A staff member passes when their weakest month clears the bar, so one
+    # sort of the per-staff minimums answers every threshold at once
+    _, selected_hours = select_months(staff, months, matrix, selected_months)
+    weakest = np.sort(selected_hours.min(axis=1)) if selected_hours.size else np.empty(0)
+    thresholds = np.asarray(thresholds)
+    passing = len(weakest) - np.searchsorted(weakest, thresholds, side="right")
+
+    return pd.DataFrame({
+        "Threshold": thresholds,
+        "PASS": passing,
+        "PASS %": np.round(100 * passing / max(len(weakest), 1), 1),
+    })
+
+
+# =====================================================
+# STATUS TIERS
+# =====================================================
+def default_tiers(threshold=FULL_TIME_HOURS):
+    return [
+        ("Full-time", "min", threshold),
+        ("Near full-time", "min", threshold - 10),
+        ("Part-time", "mean", 0),
+    ]
+
+
+def classify_tiers(staff, months, matrix, selected_months, tiers=None):
+    """Tier every staff member for the selected month keys.
+
+    ``tiers`` is a tier table as in default_tiers(). Returns one frame of
+    staff, month hours, Min, Mean and a categorical Tier column (tier
+    table order, then DEFAULT_TIER); staff with no hours in the selected
+    months are DEFAULT_TIER.
+    """
+    tiers = default_tiers() if tiers is None else list(tiers)
+    bad = [stat for _, stat, _ in tiers if stat not in TIER_STATS]
+    if bad:
+        raise ValueError(f"Unknown tier statistic(s) {bad}; expected one of {TIER_STATS}")
+
+    staff, hours = select_months(staff, months, matrix, selected_months, active_only=False)
+    stats = {"min": hours.min(axis=1), "mean": hours.mean(axis=1)}
+
+    # One np.select over every tier; the first matching condition wins
+    codes = np.select(
+        [stats[stat] > bound for _, stat, bound in tiers],
+        np.arange(len(tiers)),
+        default=len(tiers),
+    )
+
+    result = pd.DataFrame(hours, columns=month_labels(selected_months).tolist())
+    result.insert(0, COL_STAFF, staff)
+    result["Min"] = stats["min"]
+    result["Mean"] = stats["mean"].round(2)
+    result["Tier"] = pd.Categorical.from_codes(
+        codes, categories=[name for name, _, _ in tiers] + [DEFAULT_TIER]
+    )
+    return result
+
+
+# =====================================================
+# STAFF DRILLDOWN
+# =====================================================
+def build_staff_index(df):
+    """Sort a compacted frame by staff, then date, and record row offsets.
+
+    Returns (sorted frame, staff names, offsets): staff ``i``'s rows are
+    ``sorted.iloc[offsets[i]:offsets[i + 1]]``, so a lookup is a slice.
+    """
+    staff = df[COL_STAFF].astype("category")
+    codes = staff.cat.codes.to_numpy()
+    order = np.lexsort((df[COL_DATE].to_numpy(), codes))
+    sorted_codes = codes[order]
+
+    rows = df.iloc[order].reset_index(drop=True)
+    offsets = np.searchsorted(sorted_codes, np.arange(len(staff.cat.categories) + 1))
+    return rows, np.asarray(staff.cat.categories, dtype=object), offsets
+
+
+def staff_drilldown(index, staff_name, selected_months=None):
+    """(rows, daily hours, weekly hours) of one staff member.
+
+    ``index`` comes from build_staff_index; ``selected_months`` (month
+    keys) narrows the slice. Weeks start on Monday.
+    """
+    rows, staff, offsets = index
+    i = np.searchsorted(staff, staff_name)
+    if i == len(staff) or staff[i] != staff_name:
+        raise ValueError(f"No appointments for {staff_name!r}")
+
+    rows = rows.iloc[offsets[i]:offsets[i + 1]]
+    if selected_months is not None:
+        rows = rows[rows["YearMonth"].isin(selected_months)]
+
+    # Hours only for this slice, never per row of the full frame
+    rows = rows.drop(columns="YearMonth").assign(Hours=rows[COL_UNITS] / 4)
+    day = rows[COL_DATE].dt.normalize()
+    daily = rows.groupby(day)["Hours"].sum().rename_axis("Date").reset_index()
+    week = day - pd.to_timedelta(day.dt.weekday, unit="D")
+    weekly = rows.groupby(week)["Hours"].sum().rename_axis("Week of").reset_index()
+    return rows.reset_index(drop=True), daily, weekly
+
+
+# =====================================================
+# MID-MONTH PROJECTION
+# =====================================================
+def project_partial_month(
+    staff, months, matrix, as_of, threshold=FULL_TIME_HOURS,
+    months_required=MONTHS_REQUIRED, max_daily_hours=MAX_DAILY_HOURS,
+):
+    """Project full-time status for the window ending in ``as_of``'s month.
+
+    That month's hours so far are prorated by business days (Mon-Fri)
+    elapsed through ``as_of``. Status is "On pace" when the projection
+    clears the threshold, "Unable" when a prior month already failed or
+    even ``max_daily_hours`` per remaining business day cannot get there,
+    and "At risk" otherwise.
+    """
+    current = month_key(as_of)
+    window = list(range(current - months_required + 1, current + 1))
+    active_staff, window_hours = select_months(staff, months, matrix, window)
+    so_far = window_hours[:, -1]
+
+    month_start = np.datetime64(current, "M").astype("datetime64[D]")
+    month_end = np.datetime64(current + 1, "M").astype("datetime64[D]")
+    elapsed = np.busday_count(month_start, np.datetime64(as_of, "D") + 1)
+    total = np.busday_count(month_start, month_end)
+    remaining = total - elapsed
+
+    # Nothing to prorate before the first business day
+    projected = so_far * total / elapsed if elapsed else so_far
+    shortfall = np.maximum(threshold - so_far, 0)
+    prior_pass = (window_hours[:, :-1] > threshold).all(axis=1)
+    unable = ~prior_pass | (so_far + remaining * max_daily_hours <= threshold)
+
+    labels = month_labels(window).tolist()
+    result = pd.DataFrame(window_hours[:, :-1], columns=labels[:-1])
+    result.insert(0, COL_STAFF, active_staff)
+    result[f"{labels[-1]} so far"] = so_far
+    result["Projected"] = projected.round(1)
+    result["Needed / business day"] = np.divide(
+        shortfall, remaining, out=np.where(shortfall > 0, np.inf, 0.0), where=remaining > 0
+    ).round(2)
+    result["Projection"] = np.select(
+        [unable, projected > threshold], ["Unable", "On pace"], "At risk"
+    )
+    result.attrs["business_days"] = (int(elapsed), int(total))
+    return result
+
+
+# =====================================================
+# EXCEL EXPORT (Two Sheets)
+# =====================================================
+def create_excel(pass_df, no_pass_df):
+    """PASS and NO PASS sheets as xlsx bytes."""
+    return write_xlsx({"PASS": pass_df, "NO PASS": no_pass_df})
+
+
+def create_tier_excel(tiered):
+    """One sheet per tier of a classify_tiers frame, as xlsx bytes."""
+    return write_xlsx_by(tiered, "Tier")
+
+
+# =====================================================
+# FULL PIPELINE
+# =====================================================
+def run_pipeline(
+    file_name, source, months=None, threshold=FULL_TIME_HOURS, date_format=None, engine="auto",
+    months_required=MONTHS_REQUIRED,
+):
+    """Evaluate one export; months default to its last ``months_required``.
+
+    Months are "YYYY-MM" labels; see choose_months for the ValueError on
+    a wrong month count. Returns (selected months, pass_df, no_pass_df).
+    """
+    monthly_hours = load_monthly_totals(file_name, source, date_format, engine)
+    staff, all_months, hours = build_hours_matrix(monthly_hours)
+
+    selected = choose_months(all_months, months, months_required)
+    pass_df, no_pass_df = evaluate_months(staff, all_months, hours, selected, threshold)
+    return month_labels(selected).tolist(), pass_df, no_pass_df
@@ -0,0 +1,106 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("fulltime.stages")
+
+
+def size_of(obj, memory=True):
+    # (rows, bytes) of a stage's input/output. Deep memory scans every
+    # string, so callers can skip it with memory=False
+    if isinstance(obj, pd.DataFrame):
+        return len(obj), int(obj.memory_usage(deep=True).sum()) if memory else None
+    if isinstance(obj, pd.Series):
+        return len(obj), int(obj.memory_usage(deep=True)) if memory else None
+    if isinstance(obj, np.ndarray):
+        return obj.shape[0], obj.nbytes
+    if isinstance(obj, tuple):
+        # Frames in a tuple partition the rows (PASS / NO PASS) and are
+        # summed; arrays share the staff axis (hours matrix) so take the max
+        sizes = [size_of(o, memory) for o in obj]
+        frame_rows = [r for o, (r, _) in zip(obj, sizes) if isinstance(o, pd.DataFrame)]
+        other_rows = [r for o, (r, _) in zip(obj, sizes) if r is not None and not isinstance(o, pd.DataFrame)]
+        rows = sum(frame_rows) if frame_rows else max(other_rows, default=None)
+        return rows, sum(b for _, b in sizes if b is not None)
+    return None, None
+
+
+class StageRecord:
+    def __init__(self, stage, rows_in=None, memory=True):
+        self.memory = memory
+        self.data = {
+            "stage": stage,
+            "seconds": None,
+            "rows_in": rows_in,
+            "rows_out": None,
+            "mem_mb": None,
+            "cache_hit": False,
+        }
+
+    def output(self, obj):
+        rows, nbytes = size_of(obj, self.memory)
+        self.data["rows_out"] = rows
+        if nbytes is not None:
+            self.data["mem_mb"] = round(nbytes / 1024 / 1024, 2)
+        return obj
+
+
+class StageLog:
+    """Wall time, rows in/out and output memory for each pipeline stage.
+
+    Records are kept in order and emitted as one JSON log line each.
+    ``on_change`` (if given) is called with the records after each update,
+    except while inside `cached` so nothing runs inside a cached function.
+    ``measure_memory=False`` skips the deep memory scan of outputs.
+    """
+
+    def __init__(self, context=None, on_change=None, measure_memory=True):
+        self.records = []
+        self.context = context or {}
+        self.on_change = on_change
+        self.measure_memory = measure_memory
+        self._cached_depth = 0
+
+    def _add(self, data):
+        self.records.append(data)
+        logger.info(json.dumps({**self.context, **data}, default=str))
+        if self.on_change and not self._cached_depth:
+            self.on_change(self.records)
+
+    @contextmanager
+    def stage(self, name, input=None):
+        rows_in = size_of(input, memory=False)[0] if input is not None else None
+        record = StageRecord(name, rows_in, self.measure_memory)
+        start = time.perf_counter()
+        yield record
+        record.data["seconds"] = round(time.perf_counter() - start, 4)
+        self._add(record.data)
+
+    def cached(self, name, fn, *args, **kwargs):
+        # Call a cached function; if its body recorded no stages it was
+        # served from cache, which is recorded as a single cache-hit stage
+        before = len(self.records)
+        start = time.perf_counter()
+        self._cached_depth += 1
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            self._cached_depth -= 1
+
+        if len(self.records) == before:
+            seconds = round(time.perf_counter() - start, 4)
+            record = StageRecord(name, memory=self.measure_memory)
+            record.output(result)
+            record.data["seconds"] = seconds
+            record.data["cache_hit"] = True
+            self._add(record.data)
+        elif self.on_change:
+            self.on_change(self.records)
+        return result
+
+    def to_frame(self):
+        return pd.DataFrame(self.records)
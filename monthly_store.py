@@ -0,0 +1,120 @@
+import hashlib
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from fulltime_core import COL_STAFF, month_keys, month_labels
+
+DEFAULT_STORE_PATH = os.environ.get("FULLTIME_STORE", "fulltime_store.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS monthly_hours (
+    staff TEXT NOT NULL,
+    year_month TEXT NOT NULL,
+    hours REAL NOT NULL,
+    PRIMARY KEY (staff, year_month)
+);
+CREATE INDEX IF NOT EXISTS monthly_hours_month ON monthly_hours (year_month);
+CREATE TABLE IF NOT EXISTS months (
+    year_month TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    staff_count INTEGER NOT NULL,
+    source TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def month_checksums(monthly_hours):
+    # One checksum per month over its (staff, hours) rows in staff order,
+    # so re-ingesting an unchanged month is a no-op. Keyed by month key.
+    checksums = {}
+    for month, rows in monthly_hours.groupby("YearMonth"):
+        rows = rows.sort_values(COL_STAFF)
+        row_hashes = pd.util.hash_pandas_object(rows[[COL_STAFF, "Hours"]], index=False)
+        digest = hashlib.blake2b(row_hashes.to_numpy().tobytes(), digest_size=16)
+        checksums[month] = digest.hexdigest()
+    return checksums
+
+
+class MonthlyStore:
+    """SQLite store of staff × month hours, keyed by (staff, year_month).
+
+    Uploads are merged month by month: a month whose checksum matches the
+    stored one is skipped, a changed month is replaced as a whole. Months
+    are stored as "YYYY-MM" text and read back as month keys.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # One committed transaction per call, and the connection is closed
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def ingest(self, monthly_hours, source=None):
+        """Merge monthly totals; returns {"added"|"replaced"|"unchanged": [months]}."""
+        summary = {"added": [], "replaced": [], "unchanged": []}
+        if monthly_hours.empty:
+            return summary
+
+        checksums = month_checksums(monthly_hours)
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        with self._connect() as conn:
+            stored = dict(conn.execute("SELECT year_month, checksum FROM months"))
+            for key, checksum in checksums.items():
+                month = str(month_labels([key])[0])
+                if stored.get(month) == checksum:
+                    summary["unchanged"].append(month)
+                    continue
+
+                rows = monthly_hours[monthly_hours["YearMonth"] == key]
+                conn.execute("DELETE FROM monthly_hours WHERE year_month = ?", (month,))
+                conn.executemany(
+                    "INSERT INTO monthly_hours (staff, year_month, hours) VALUES (?, ?, ?)",
+                    zip(rows[COL_STAFF].astype(str), [month] * len(rows), rows["Hours"].astype(float)),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO months VALUES (?, ?, ?, ?, ?)",
+                    (month, checksum, len(rows), source, now),
+                )
+                summary["replaced" if month in stored else "added"].append(month)
+        return summary
+
+    def read(self, months=None):
+        """Stored totals as a frame shaped like aggregate_monthly's output."""
+        query = "SELECT staff, year_month, hours FROM monthly_hours"
+        params = ()
+        if months:
+            query += f" WHERE year_month IN ({','.join('?' * len(months))})"
+            params = tuple(month_labels(months).tolist())
+
+        with self._connect() as conn:
+            frame = pd.read_sql_query(query + " ORDER BY staff, year_month", conn, params=params)
+        frame["year_month"] = month_keys(frame["year_month"].to_numpy(dtype=str))
+        return frame.rename(columns={"staff": COL_STAFF, "year_month": "YearMonth", "hours": "Hours"})
+
+    def months(self):
+        with self._connect() as conn:
+            return pd.read_sql_query("SELECT * FROM months ORDER BY year_month", conn)
+
+    def version(self):
+        # Changes whenever any month is added or replaced; used as cache key
+        with self._connect() as conn:
+            rows = conn.execute("SELECT year_month, checksum FROM months ORDER BY year_month")
+            digest = hashlib.blake2b(digest_size=16)
+            for month, checksum in rows:
+                digest.update(f"{month}:{checksum};".encode())
+        return digest.hexdigest()
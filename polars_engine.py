@@ -0,0 +1,133 @@
+import pandas as pd
+
+from fulltime_core import (
+    COL_COMPLETED,
+    COL_DATE,
+    COL_SERVICE,
+    COL_STAFF,
+    COL_UNITS,
+    COMPLETED_VALUE,
+    DATE_FORMATS,
+    DATE_SAMPLE_SIZE,
+    EXCEL_SERIAL_MAX,
+    EXCEL_SERIAL_MIN,
+    SERVICE_VALUE,
+    infer_date_format,
+    is_parquet_name,
+    required_cols,
+)
+from xlsx_io import as_source
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+
+def scan(file_name, source):
+    if is_parquet_name(file_name):
+        frame = pl.scan_parquet(as_source(source))
+    else:
+        # Every column as text, cast below, like the DuckDB engine
+        frame = pl.scan_csv(as_source(source), infer_schema_length=0)
+
+    schema = frame.collect_schema()
+    missing = [c for c in required_cols if c not in schema.names()]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    # Typed Parquet dates stay dates: as text they would match no format
+    return frame.select([
+        pl.col(c) if schema[c].is_temporal() else pl.col(c).cast(pl.Utf8)
+        for c in required_cols
+    ])
+
+
+def appointment_date(date_format=None, dtype=None):
+    if dtype is not None and dtype.is_temporal():
+        return pl.col(COL_DATE).cast(pl.Datetime)
+
+    # Excel serial numbers first (as in parse_dates), then the first
+    # string format that parses
+    appt = pl.col(COL_DATE).str.strip_chars()
+    serial = appt.cast(pl.Float64, strict=False)
+    serial_date = pl.date(1899, 12, 30).cast(pl.Datetime) + pl.duration(
+        days=serial.floor().cast(pl.Int64)
+    )
+
+    formats = ([date_format] if date_format else []) + DATE_FORMATS
+    parsed = pl.coalesce([
+        appt.str.strptime(pl.Datetime, fmt, strict=False) for fmt in formats
+    ])
+    return (
+        pl.when(serial.is_between(EXCEL_SERIAL_MIN, EXCEL_SERIAL_MAX))
+        .then(serial_date)
+        .otherwise(parsed)
+    )
+
+
+def polars_monthly_totals(file_name, source, date_format=None):
+    """Monthly totals from a lazy Polars scan of a CSV/Parquet export.
+
+    The Completed/Service filters are pushed down into the scan and the
+    group-by runs multithreaded; the result comes back as a pandas frame
+    shaped like aggregate_monthly's output. Rows left out because no format
+    read their Appt. Date are counted in ``attrs["unparsed_date_rows"]``.
+    """
+    if pl is None:
+        raise ValueError("The Polars engine needs the polars package installed")
+
+    units = pl.col(COL_UNITS).str.strip_chars().cast(pl.Float64, strict=False)
+    frame = scan(file_name, source).filter(
+        (pl.col(COL_COMPLETED).str.strip_chars().str.to_lowercase() == COMPLETED_VALUE)
+        & (pl.col(COL_SERVICE).str.strip_chars() == SERVICE_VALUE)
+    )
+    date_dtype = frame.collect_schema()[COL_DATE]
+    has_date = pl.col(COL_DATE).is_not_null()
+    if not date_dtype.is_temporal():
+        appt = pl.col(COL_DATE).str.strip_chars()
+        has_date &= appt != ""
+        # Without a date_format, try the one a sample of string (not serial)
+        # dates suggests first, as parse_dates would
+        if not date_format:
+            is_serial = appt.cast(pl.Float64, strict=False).is_between(
+                EXCEL_SERIAL_MIN, EXCEL_SERIAL_MAX
+            ).fill_null(False)
+            sample = frame.filter(has_date & ~is_serial).select(appt).head(DATE_SAMPLE_SIZE).collect()
+            date_format = infer_date_format(pd.Series(sample[COL_DATE].to_list(), dtype=object))
+
+    totals = (
+        frame
+        .select(
+            pl.col(COL_STAFF),
+            appointment_date(date_format, date_dtype).alias("AppointmentDate"),
+            (units.fill_nan(0).fill_null(0) / 4).alias("Hours"),
+            has_date.alias("HasDate"),
+        )
+        .group_by(
+            pl.col(COL_STAFF),
+            # Month key as in fulltime_core.month_keys
+            ((pl.col("AppointmentDate").dt.year() - 1970) * 12
+             + pl.col("AppointmentDate").dt.month() - 1).cast(pl.Int32).alias("YearMonth"),
+        )
+        .agg(
+            pl.col("Hours").sum(),
+            (pl.col("HasDate") & pl.col("AppointmentDate").is_null()).sum().alias("UnparsedDates"),
+        )
+        .collect()
+    )
+    unparsed = int(totals["UnparsedDates"].sum())
+    totals = (
+        totals
+        .filter(pl.col("YearMonth").is_not_null() & pl.col(COL_STAFF).is_not_null())
+        .drop("UnparsedDates")
+        .sort([COL_STAFF, "YearMonth"])
+    )
+
+    # The aggregate is small; going through a dict avoids needing pyarrow
+    result = pd.DataFrame(totals.to_dict(as_series=False))
+    if result.empty:
+        result = pd.DataFrame({COL_STAFF: [], "YearMonth": [], "Hours": []})
+    result.attrs["slow_date_rows"] = 0
+    result.attrs["unparsed_date_rows"] = unparsed
+    return result